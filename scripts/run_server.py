@@ -2,15 +2,38 @@
 
 import sys
 import os
+import argparse
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 import uvicorn
 
+
+def default_workers() -> int:
+    """Worker count from WEB_CONCURRENCY, else 2 * usable cores + 1."""
+    if os.environ.get("WEB_CONCURRENCY"):
+        return int(os.environ["WEB_CONCURRENCY"])
+    # sched_getaffinity honours CPU pinning and cpusets, unlike os.cpu_count()
+    if hasattr(os, "sched_getaffinity"):
+        cores = len(os.sched_getaffinity(0))
+    else:
+        cores = os.cpu_count() or 1
+    return cores * 2 + 1
+
+
 if __name__ == "__main__":
-    uvicorn.run(
-        "mas_api.main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
-        log_level="info"
-    ) 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Start the imaging window builder API")
+    parser.add_argument("--dev", action="store_true", help="Run a single auto-reloading worker for development")
+    args = parser.parse_args()
+
+    options = {
+        "host": "0.0.0.0",
+        "port": 8000,
+        "log_level": "info"
+    }
+    if args.dev:
+        options["reload"] = True
+    else:
+        # loop and http stay "auto": uvloop and httptools are used when installed
+        options["workers"] = default_workers()
+
+    uvicorn.run("mas_api.main:app", **options)
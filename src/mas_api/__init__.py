@@ -1,4 +1,4 @@
-from .main import app, ImagingActivity, ImagingWindowBuilder
+from .main import app, ImagingActivityInput, ImagingWindowBuilder
  
 __version__ = "1.0.0"
-__all__ = ["app", "ImagingActivity", "ImagingWindowBuilder"] 
\ No newline at end of file
+__all__ = ["app", "ImagingActivityInput", "ImagingWindowBuilder"] 
\ No newline at end of file
@@ -1,51 +1,68 @@
-from typing import List, Dict, Optional
-from datetime import datetime
-import json
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel, Field, validator
+from typing import Annotated, Any, Callable, Coroutine, Iterator, List, Dict, Literal, Optional
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from functools import cached_property
+from anyio import to_thread
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from fastapi.routing import APIRoute
+from pydantic import AfterValidator, BaseModel, ConfigDict, Field, TypeAdapter, WithJsonSchema
+import orjson
 import uvicorn
 
 
-class ImagingActivityInput(BaseModel):
+ActivityState = Literal["scheduled", "proposed"]
+
+
+def parse_timestamp(value: str) -> datetime:
+    """Parse an ISO 8601 timestamp, accepting a 'Z' suffix for UTC."""
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def validate_iso_timestamp(value: str) -> str:
+    """Validate ISO 8601 format, keeping the original string for the response."""
+    try:
+        parse_timestamp(value)
+    except ValueError:
+        raise ValueError(f"Invalid ISO 8601 timestamp: {value}")
+    return value
+
+
+# Timestamps stay as the client's strings, so responses echo them byte for byte.
+IsoTimestamp = Annotated[
+    str,
+    AfterValidator(validate_iso_timestamp),
+    WithJsonSchema({"type": "string", "format": "date-time"}),
+]
+
+
+class FrozenModel(BaseModel):
+    """Base model for request payloads, which are never modified after validation."""
+    model_config = ConfigDict(frozen=True)
+
+
+class ImagingActivityInput(FrozenModel):
     """Input model for imaging activity data."""
     satellite_hw_id: str = Field(..., description="Unique satellite hardware identifier")
-    start_time: str = Field(..., description="ISO 8601 timestamp with timezone (e.g., '2024-07-12T00:34:05Z')")
-    end_time: str = Field(..., description="ISO 8601 timestamp with timezone")
-    activity_state: Optional[str] = Field(None, description="Activity state: 'scheduled' or 'proposed'")
-    
-    @validator('start_time', 'end_time')
-    def validate_iso_timestamp(cls, v):
-        """Validate ISO 8601 format and timezone handling"""
-        try:
-            datetime.fromisoformat(v.replace("Z", "+00:00"))
-            return v
-        except ValueError:
-            raise ValueError(f"Invalid ISO 8601 timestamp: {v}")
-    
-    @validator('activity_state')
-    def validate_activity_state(cls, v):
-        """Validate activity state values"""
-        if v is not None and v not in ['scheduled', 'proposed']:
-            raise ValueError("activity_state must be 'scheduled' or 'proposed'")
-        return v
+    start_time: IsoTimestamp = Field(..., description="ISO 8601 timestamp with timezone (e.g., '2024-07-12T00:34:05Z')")
+    end_time: IsoTimestamp = Field(..., description="ISO 8601 timestamp with timezone")
+    activity_state: Optional[ActivityState] = Field(None, description="Activity state: 'scheduled' or 'proposed'")
+
 
+class StreamingActivityInput(ImagingActivityInput):
+    """Input model for imaging activity data that must carry an activity_state."""
+    activity_state: ActivityState = Field(..., description="Activity state: 'scheduled' or 'proposed'")
 
-class ChronologicalWindowRequest(BaseModel):
+
+class ChronologicalWindowRequest(FrozenModel):
     """Request model for chronological window endpoint"""
     activities: List[ImagingActivityInput] = Field(..., description="List of imaging activities to sort chronologically")
 
 
-class StreamingWindowRequest(BaseModel):
+class StreamingWindowRequest(FrozenModel):
     """Request model for streaming windows endpoint"""
-    activities: List[ImagingActivityInput] = Field(..., description="List of imaging activities with activity_state")
-    
-    @validator('activities')
-    def validate_activities_have_state(cls, v):
-        """Ensure all activities have activity_state for streaming windows"""
-        for activity in v:
-            if activity.activity_state is None:
-                raise ValueError("All activities must have 'activity_state' for streaming windows")
-        return v
+    activities: List[StreamingActivityInput] = Field(..., description="List of imaging activities with activity_state")
 
 
 class ChronologicalWindowResponse(BaseModel):
@@ -61,42 +78,51 @@ class StreamingWindowsResponse(BaseModel):
     total_activities: int = Field(..., description="Total number of activities across all windows")
 
 
-class ImagingActivity:
-    """Represents a single imaging activity by a satellite."""
-    
-    def __init__(self, satellite_hw_id: str, start_time: str, end_time: str, activity_state: Optional[str] = None):
-        self.satellite_hw_id = satellite_hw_id
-        self.start_time_str = start_time
-        self.end_time_str = end_time
-        self.start_time = datetime.fromisoformat(start_time.replace("Z", "+00:00"))
-        self.end_time = datetime.fromisoformat(end_time.replace("Z", "+00:00"))
-        self.activity_state = activity_state
-
-    def to_dict(self) -> Dict:
-        """Convert to dictionary format for JSON output."""
-        data = {
-            "satellite_hw_id": self.satellite_hw_id,
-            "start_time": self.start_time_str,
-            "end_time": self.end_time_str
-        }
-        if self.activity_state:
-            data["activity_state"] = self.activity_state
-        return data
-
-    def __repr__(self):
-        return json.dumps(self.to_dict(), indent=2)
+_ACTIVITY_LIST_ADAPTER = TypeAdapter(List[ImagingActivityInput])
+
+def sort_key(timestamp: str) -> float:
+    """
+    Convert an ISO 8601 timestamp to a POSIX timestamp for sorting.
+    Naive timestamps are read as UTC so the order does not depend on the host timezone.
+    """
+    value = parse_timestamp(timestamp)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
 
 
 class ImagingWindowBuilder:
     """Builds imaging windows for satellite imaging activities."""
     
-    def __init__(self, activities: List[ImagingActivity]):
+    def __init__(self, activities: List[ImagingActivityInput]):
         self.activities = activities
 
+    @cached_property
+    def entries(self) -> List[Dict]:
+        """Response entries for all activities in input order, dumped once and shared by both builds."""
+        return _ACTIVITY_LIST_ADAPTER.dump_python(self.activities, mode="json", exclude_none=True)
+
+    # Time columns hold one POSIX timestamp per activity in input order, since
+    # floats compare far faster than timezone-aware datetimes.
+    @cached_property
+    def start_times(self) -> List[float]:
+        """Sort keys for each activity's start_time."""
+        return [sort_key(activity.start_time) for activity in self.activities]
+
+    @cached_property
+    def end_times(self) -> List[float]:
+        """Sort keys for each activity's end_time."""
+        return [sort_key(activity.end_time) for activity in self.activities]
+
+    @cached_property
+    def sorted_order(self) -> List[int]:
+        """Activity indices ordered by start_time, computed once and shared by both builds."""
+        return sorted(range(len(self.activities)), key=self.start_times.__getitem__)
+
     def build_chronological_window(self) -> List[Dict]:
         """Sort all imaging activities by start_time."""
-        sorted_activities = sorted(self.activities, key=lambda a: a.start_time)
-        return [activity.to_dict() for activity in sorted_activities]
+        entries = self.entries
+        return [entries[i] for i in self.sorted_order]
 
     def build_streaming_windows_by_state(self) -> List[List[Dict]]:
         """
@@ -106,30 +132,89 @@ class ImagingWindowBuilder:
         if any(activity.activity_state is None for activity in self.activities):
             raise ValueError("All activities must have 'activity_state' to build state windows.")
 
-        sorted_activities = sorted(self.activities, key=lambda a: a.start_time)
-        windows = []
-        current_window = []
-        last_state = None
-        last_end_time = None
+        activities = self.activities
+        order = self.sorted_order
+        if not order:
+            return []
+
+        # Columns are gathered in input order, which walks the models in memory
+        # order, and only then permuted into start_time order.
+        states = [activity.activity_state for activity in activities]
+        start_times = self.start_times
+        end_times = self.end_times
+        entries = self.entries
+        states = [states[i] for i in order]
+        start_times = [start_times[i] for i in order]
+        end_times = [end_times[i] for i in order]
+        entries = [entries[i] for i in order]
+
+        # A new window starts wherever the state changes or an activity starts
+        # before the previous one has ended.
+        boundaries = [
+            position
+            for position, (state, previous_state, start_time, previous_end_time)
+            in enumerate(zip(states[1:], states, start_times[1:], end_times), 1)
+            if state != previous_state or start_time < previous_end_time
+        ]
+
+        return [
+            entries[start:stop]
+            for start, stop in zip([0] + boundaries, boundaries + [len(entries)])
+        ]
+
+
+# Number of windows encoded into each chunk of a streamed response body.
+STREAM_CHUNK_WINDOWS = 256
+
+
+def iter_streaming_windows_body(windows: List[List[Dict]], total_activities: int) -> Iterator[bytes]:
+    """
+    Encode a streaming windows response as JSON, a batch of windows at a time.
+    The windows themselves are already built; only the encoded body is produced
+    incrementally, so it is never held as a single bytes object.
+    """
+    yield b'{"windows":['
+    for start in range(0, len(windows), STREAM_CHUNK_WINDOWS):
+        # Dumping the batch as a list and dropping its brackets joins the windows with commas.
+        chunk = orjson.dumps(windows[start:start + STREAM_CHUNK_WINDOWS])[1:-1]
+        yield b"," + chunk if start else chunk
+    yield b'],"window_count":%d,"total_activities":%d}' % (len(windows), total_activities)
+
+
+class ORJSONRequest(Request):
+    """Request whose JSON body is decoded with orjson instead of the stdlib json module."""
+
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            self._json = orjson.loads(await self.body())
+        return self._json
 
-        for activity in sorted_activities:
-            if (last_state is None) or \
-               (activity.activity_state != last_state) or \
-               (last_end_time and activity.start_time < last_end_time):
-                
-                if current_window:
-                    windows.append(current_window)
-                current_window = [activity.to_dict()]
-            else:
-                current_window.append(activity.to_dict())
 
-            last_state = activity.activity_state
-            last_end_time = activity.end_time
+class ORJSONRoute(APIRoute):
+    """
+    Route that hands FastAPI an ORJSONRequest, so request bodies are decoded by orjson
+    before validation. orjson.JSONDecodeError subclasses json.JSONDecodeError, so
+    malformed bodies are still reported as 422 json_invalid errors.
+    """
 
-        if current_window:
-            windows.append(current_window)
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        route_handler = super().get_route_handler()
 
-        return windows
+        async def orjson_route_handler(request: Request) -> Response:
+            return await route_handler(ORJSONRequest(request.scope, request.receive))
+
+        return orjson_route_handler
+
+
+# Sync endpoints run on anyio's worker threadpool, which defaults to 40 threads.
+THREADPOOL_SIZE = 128
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Size the worker threadpool before the service starts accepting requests."""
+    to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    yield
 
 
 app = FastAPI(
@@ -137,8 +222,12 @@ app = FastAPI(
     description="Imaging Window Builder API for SkySat constellation management",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
+app.router.route_class = ORJSONRoute
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=4)
 
 
 @app.get("/health")
@@ -149,30 +238,20 @@ async def health_check():
 
 @app.post(
     "/imaging-windows/chronological",
-    response_model=ChronologicalWindowResponse,
+    responses={200: {"model": ChronologicalWindowResponse}},
     summary="Build Chronological Imaging Window",
     description="Sorts imaging activities chronologically by start time for basic customer visibility"
 )
-async def build_chronological_window(request: ChronologicalWindowRequest):
+def build_chronological_window(request: ChronologicalWindowRequest):
     """Build chronological imaging window."""
     try:
-        activities = [
-            ImagingActivity(
-                satellite_hw_id=activity.satellite_hw_id,
-                start_time=activity.start_time,
-                end_time=activity.end_time,
-                activity_state=activity.activity_state
-            )
-            for activity in request.activities
-        ]
-        
-        builder = ImagingWindowBuilder(activities)
+        builder = ImagingWindowBuilder(request.activities)
         window = builder.build_chronological_window()
         
-        return ChronologicalWindowResponse(
-            window=window,
-            count=len(window)
-        )
+        return ORJSONResponse({
+            "window": window,
+            "count": len(window)
+        })
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
@@ -180,32 +259,25 @@ async def build_chronological_window(request: ChronologicalWindowRequest):
 
 @app.post(
     "/imaging-windows/streaming",
-    response_model=StreamingWindowsResponse,
+    responses={200: {"model": StreamingWindowsResponse}},
     summary="Build Streaming Windows by Activity State",
     description="Groups activities by state with non-overlapping temporal constraint for advanced scheduling"
 )
-async def build_streaming_windows(request: StreamingWindowRequest):
+def build_streaming_windows(request: StreamingWindowRequest):
     """Build streaming windows by activity state."""
     try:
-        activities = [
-            ImagingActivity(
-                satellite_hw_id=activity.satellite_hw_id,
-                start_time=activity.start_time,
-                end_time=activity.end_time,
-                activity_state=activity.activity_state
-            )
-            for activity in request.activities
-        ]
-        
-        builder = ImagingWindowBuilder(activities)
+        builder = ImagingWindowBuilder(request.activities)
         windows = builder.build_streaming_windows_by_state()
         
-        total_activities = sum(len(window) for window in windows)
+        # Every activity lands in exactly one window.
+        total_activities = len(request.activities)
         
-        return StreamingWindowsResponse(
-            windows=windows,
-            window_count=len(windows),
-            total_activities=total_activities
+        # The body is encoded after this handler returns, so an encoding error would
+        # abort the stream rather than become a 500. Entries are JSON-mode dumps of
+        # strings only, which orjson always encodes.
+        return StreamingResponse(
+            iter_streaming_windows_body(windows, total_activities),
+            media_type="application/json"
         )
         
     except ValueError as e:
@@ -0,0 +1,120 @@
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import json
+import orjson
+import pytest
+from anyio import to_thread
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+from mas_api.main import app, THREADPOOL_SIZE, ImagingWindowBuilder, ORJSONRoute, StreamingWindowRequest
+
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+
+
+client = TestClient(app)
+
+
+def _activity(start_time, end_time, **fields):
+    return {"satellite_hw_id": "s112", "start_time": start_time, "end_time": end_time, **fields}
+
+
+class TestApiEndpoints:
+
+    def test_lifespan_threadpool_size_pass(self):
+        with TestClient(app) as lifespan_client:
+            limiter = lifespan_client.portal.call(to_thread.current_default_thread_limiter)
+
+            assert limiter.total_tokens == THREADPOOL_SIZE
+
+    def test_chronological_window_pass(self):
+        body = json.dumps({"activities": [
+            _activity("2024-07-12T01:03:49Z", "2024-07-12T01:04:08Z"),
+            _activity("2024-07-12T00:34:05Z", "2024-07-12T00:34:08Z"),
+        ]})
+
+        response = client.post("/imaging-windows/chronological", content=body, headers={"content-type": "application/json"})
+
+        assert response.status_code == 200
+        assert response.json()["count"] == 2
+        assert [a["start_time"] for a in response.json()["window"]] == ["2024-07-12T00:34:05Z", "2024-07-12T01:03:49Z"]
+
+    def test_chronological_window_malformed_body_fail(self):
+        response = client.post("/imaging-windows/chronological", content=b'{"activities": [', headers={"content-type": "application/json"})
+
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["type"] == "json_invalid"
+
+    def test_orjson_route_class_pass(self, monkeypatch):
+        assert all(isinstance(r, ORJSONRoute) for r in app.routes if isinstance(r, APIRoute))
+        calls = []
+        loads = orjson.loads
+        monkeypatch.setattr(orjson, "loads", lambda data: calls.append(data) or loads(data))
+        body = json.dumps({"activities": [_activity("2024-07-12T00:34:05Z", "2024-07-12T00:34:08Z")]})
+
+        response = client.post("/imaging-windows/chronological", content=body, headers={"content-type": "application/json"})
+
+        assert response.status_code == 200
+        assert calls == [body.encode()]
+
+    @pytest.mark.parametrize("activity_state", ["x", ""])
+    def test_chronological_window_invalid_state_fail(self, activity_state):
+        activities = [_activity("2024-07-12T00:34:05Z", "2024-07-12T00:34:08Z", activity_state=activity_state)]
+
+        response = client.post("/imaging-windows/chronological", json={"activities": activities})
+
+        assert response.status_code == 422
+        errors = response.json()["detail"]
+        assert errors[0]["loc"] == ["body", "activities", 0, "activity_state"]
+        assert errors[0]["type"] == "literal_error"
+
+    def test_streaming_windows_pass(self):
+        with open(os.path.join(DATA_DIR, "sample_data_with_states.json")) as f:
+            payload = json.load(f)
+        expected = ImagingWindowBuilder(
+            StreamingWindowRequest(**payload).activities
+        ).build_streaming_windows_by_state()
+
+        response = client.post("/imaging-windows/streaming", json=payload)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        assert response.json() == {
+            "windows": expected,
+            "window_count": len(expected),
+            "total_activities": len(payload["activities"]),
+        }
+
+    @pytest.mark.parametrize("state_fields", [{}, {"activity_state": None}])
+    def test_streaming_windows_missing_state_fail(self, state_fields):
+        activities = [
+            _activity("2024-07-12T00:34:05Z", "2024-07-12T00:34:08Z", activity_state="scheduled"),
+            _activity("2024-07-12T00:37:58Z", "2024-07-12T00:38:20Z", **state_fields),
+        ]
+
+        response = client.post("/imaging-windows/streaming", json={"activities": activities})
+
+        assert response.status_code == 422
+        errors = response.json()["detail"]
+        assert len(errors) == 1
+        assert errors[0]["loc"] == ["body", "activities", 1, "activity_state"]
+
+    @pytest.mark.parametrize("endpoint, count_field", [("chronological", "count"), ("streaming", "total_activities")])
+    def test_gzip_response_pass(self, endpoint, count_field):
+        activities = [
+            _activity(f"2024-07-12T00:{minute:02d}:05Z", f"2024-07-12T00:{minute:02d}:08Z", activity_state="scheduled")
+            for minute in range(40)
+        ]
+
+        response = client.post(f"/imaging-windows/{endpoint}", json={"activities": activities}, headers={"accept-encoding": "gzip"})
+
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.json()[count_field] == 40
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -1,18 +1,35 @@
 
 import sys
 import os
+import time
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
+import json
 import pytest
-from mas_api.main import ImagingActivity, ImagingWindowBuilder
+from pydantic import ValidationError
+from mas_api.main import (
+    STREAM_CHUNK_WINDOWS,
+    ImagingActivityInput,
+    ImagingWindowBuilder,
+    iter_streaming_windows_body,
+)
+
+
+def _activity(satellite_hw_id, start_time, end_time, activity_state=None):
+    return ImagingActivityInput(
+        satellite_hw_id=satellite_hw_id,
+        start_time=start_time,
+        end_time=end_time,
+        activity_state=activity_state
+    )
 
 
 class TestMainFunctions:
     
     def test_chronological_window_pass(self):
         activities = [
-            ImagingActivity("s112", "2024-07-12T01:03:49Z", "2024-07-12T01:04:08Z"),
-            ImagingActivity("s112", "2024-07-12T00:34:05Z", "2024-07-12T00:34:08Z"),
+            _activity("s112", "2024-07-12T01:03:49Z", "2024-07-12T01:04:08Z"),
+            _activity("s112", "2024-07-12T00:34:05Z", "2024-07-12T00:34:08Z"),
         ]
         
         builder = ImagingWindowBuilder(activities)
@@ -22,10 +39,66 @@ class TestMainFunctions:
         assert result[1]["start_time"] == "2024-07-12T01:03:49Z"
         assert len(result) == 2
     
+    def test_chronological_window_mixed_layouts_pass(self):
+        activities = [
+            _activity("s112", "2024-07-12T00:34:05Z", "2024-07-12T00:34:08Z"),
+            _activity("s112", "2024-07-12T00:34:04.500Z", "2024-07-12T00:34:06Z"),
+            _activity("s112", "2024-07-12T05:34:04+05:30", "2024-07-12T05:34:06+05:30"),
+        ]
+        
+        builder = ImagingWindowBuilder(activities)
+        result = builder.build_chronological_window()
+        
+        assert [a["start_time"] for a in result] == [
+            "2024-07-12T05:34:04+05:30",
+            "2024-07-12T00:34:04.500Z",
+            "2024-07-12T00:34:05Z",
+        ]
+    
+    @pytest.mark.skipif(not hasattr(time, "tzset"), reason="time.tzset is POSIX-only")
+    def test_chronological_window_host_timezone_pass(self, monkeypatch):
+        monkeypatch.setenv("TZ", "America/New_York")
+        time.tzset()
+        try:
+            activities = [
+                _activity("late", "2024-03-10T03:10:00", "2024-03-10T03:20:00"),
+                _activity("early", "2024-03-10T02:30:00.5", "2024-03-10T02:40:00"),
+                _activity("middle", "2024-03-10T06:45:00Z", "2024-03-10T06:50:00Z"),
+            ]
+            
+            builder = ImagingWindowBuilder(activities)
+            result = builder.build_chronological_window()
+        finally:
+            monkeypatch.undo()
+            time.tzset()
+        
+        assert [a["satellite_hw_id"] for a in result] == ["early", "late", "middle"]
+    
+    def test_timestamp_echo_pass(self):
+        activities = [
+            _activity("s112", "2024-07-12T00:34:05+00:00", "2024-07-12T00:34:05.5Z"),
+            _activity("s112", "2024-07-12 00:35:05Z", "2024-07-12 00:35:08.123+05:30"),
+            _activity("s112", "2024-07-12T00:36:05", "2024-07-13"),
+        ]
+        
+        builder = ImagingWindowBuilder(activities)
+        result = builder.build_chronological_window()
+        
+        assert [(a["start_time"], a["end_time"]) for a in result] == [
+            ("2024-07-12T00:34:05+00:00", "2024-07-12T00:34:05.5Z"),
+            ("2024-07-12 00:35:05Z", "2024-07-12 00:35:08.123+05:30"),
+            ("2024-07-12T00:36:05", "2024-07-13"),
+        ]
+    
+    @pytest.mark.parametrize("timestamp", [1720744445, "nope", "2024-13-01T00:00:00Z"])
+    def test_timestamp_validation_fail(self, timestamp):
+        with pytest.raises(ValidationError):
+            _activity("s112", timestamp, "2024-07-12T00:34:08Z")
+    
     def test_streaming_windows_pass(self):
         activities = [
-            ImagingActivity("s112", "2024-07-12T00:34:05Z", "2024-07-12T00:34:08Z", "scheduled"),
-            ImagingActivity("s112", "2024-07-12T00:37:58Z", "2024-07-12T00:38:20Z", "proposed"),
+            _activity("s112", "2024-07-12T00:34:05Z", "2024-07-12T00:34:08Z", "scheduled"),
+            _activity("s112", "2024-07-12T00:37:58Z", "2024-07-12T00:38:20Z", "proposed"),
         ]
         
         builder = ImagingWindowBuilder(activities)
@@ -35,9 +108,25 @@ class TestMainFunctions:
         assert result[0][0]["activity_state"] == "scheduled"
         assert result[1][0]["activity_state"] == "proposed"
     
+    @pytest.mark.parametrize("window_count", [0, 1, STREAM_CHUNK_WINDOWS, STREAM_CHUNK_WINDOWS + 1])
+    def test_streaming_windows_body_pass(self, window_count):
+        windows = [
+            [{"satellite_hw_id": f"s{i}", "activity_state": "scheduled"}] * (i % 3 + 1)
+            for i in range(window_count)
+        ]
+        total_activities = sum(len(window) for window in windows)
+        
+        body = b"".join(iter_streaming_windows_body(windows, total_activities))
+        
+        assert json.loads(body) == {
+            "windows": windows,
+            "window_count": window_count,
+            "total_activities": total_activities,
+        }
+    
     def test_streaming_windows_fail(self):
         activities = [
-            ImagingActivity("s112", "2024-07-12T00:34:05Z", "2024-07-12T00:34:08Z")
+            _activity("s112", "2024-07-12T00:34:05Z", "2024-07-12T00:34:08Z")
         ]
         
         builder = ImagingWindowBuilder(activities)